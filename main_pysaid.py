@@ -1,25 +1,38 @@
+import time
+# Засекаем до импорта PyQt6 и paramiko — они занимают большую часть холодного старта
+APP_START = time.perf_counter()
 import os
 import sys
 import json
-import time
 import threading
 import queue
+import gzip
+import hashlib
+import importlib.util
+import shutil
+import tempfile
+import zlib
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QTableWidget, QTableWidgetItem, QLabel, QHeaderView,
     QFileDialog, QMessageBox, QTextEdit, QAbstractItemView,
     QDialog, QGridLayout, QLineEdit, QRadioButton, QButtonGroup,
-    QSplitter, QSizePolicy, QToolButton, QScrollArea, QSpacerItem
+    QSplitter, QSizePolicy, QToolButton, QScrollArea, QSpacerItem, QCheckBox
 )
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont
 import paramiko
 from paramiko import Ed25519Key
-import PyQt6.uic # <--- Добавлен импорт uic
 
 # === Пути ===
 APP_DIR = os.path.dirname(os.path.abspath(sys.executable if getattr(sys, 'frozen', False) else __file__))
 CONFIG_PATH = os.path.join(APP_DIR, 'workspaces.json')
+UI_PATH = os.path.join(APP_DIR, 'main_window.ui')
+UI_CACHE_PATH = os.path.join(APP_DIR, 'ui_main_window.py')  # Скомпилированный main_window.ui
+UI_HASH_PREFIX = '# ui-sha256: '  # Первая строка кэша: хэш .ui, из которого он собран
+STYLES_PATH = os.path.join(APP_DIR, 'styles.css')
+RESUME_STAGGER_MS = 300  # Интервал между запусками рабочих мест при автовосстановлении
+RESUME_REPORT_TIMEOUT = 120  # Через сколько секунд отчитаться о восстановлении, даже если не все подключились
 os.makedirs(APP_DIR, exist_ok=True)
 
 # === Вспомогательные функции ===
@@ -37,6 +50,99 @@ def save_config(data):
     with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=4, ensure_ascii=False)
 
+def ui_source_hash():
+    """Возвращает SHA-256 содержимого main_window.ui."""
+    with open(UI_PATH, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def ui_cache_is_fresh():
+    """Проверяет, что ui_main_window.py собран из текущего main_window.ui.
+
+    Сравнивается хэш содержимого, а не время изменения: при распаковке
+    обновления .ui может получить дату старше, чем у кэша.
+    """
+    if not os.path.exists(UI_CACHE_PATH):
+        return False
+    if not os.path.exists(UI_PATH):
+        # Сборка без .ui — используем то, что поставлено
+        return True
+    try:
+        with open(UI_CACHE_PATH, 'r', encoding='utf-8') as f:
+            first_line = f.readline().rstrip('\n')
+        return first_line == UI_HASH_PREFIX + ui_source_hash()
+    except (OSError, UnicodeDecodeError):
+        return False
+
+def load_ui_class():
+    """Возвращает класс Ui_MainWindow.
+
+    Берётся из скомпилированного ui_main_window.py, если он актуален; иначе
+    main_window.ui разбирается в памяти. На диск функция ничего не пишет.
+    """
+    if ui_cache_is_fresh():
+        try:
+            spec = importlib.util.spec_from_file_location('ui_main_window', UI_CACHE_PATH)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            return module.Ui_MainWindow
+        except Exception:
+            # Повреждённый кэш — разбираем .ui как обычно, compile_ui() перезапишет его
+            pass
+    import PyQt6.uic
+    return PyQt6.uic.loadUiType(UI_PATH)[0]
+
+def compile_ui():
+    """Компилирует main_window.ui в ui_main_window.py для следующих запусков.
+
+    Запись идёт во временный файл, который затем атомарно заменяет кэш,
+    так что прерванная компиляция не оставляет обрезанный модуль.
+    """
+    if not os.path.exists(UI_PATH) or ui_cache_is_fresh():
+        return
+    import PyQt6.uic
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix='ui_main_window.', suffix='.tmp', dir=os.path.dirname(UI_CACHE_PATH))
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(UI_HASH_PREFIX + ui_source_hash() + '\n')
+            PyQt6.uic.compileUi(UI_PATH, f)
+        os.replace(tmp_path, UI_CACHE_PATH)
+        tmp_path = None
+    except Exception:
+        # Без кэша приложение работает, просто .ui будет разбираться при каждом запуске
+        pass
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+# === Сжатие файлов ===
+COMPRESSED_SUFFIX = '.hwgz'  # Суффикс файлов, сжатых на лету при отправке
+COMPRESS_SAMPLE_SIZE = 64 * 1024  # Размер пробы для оценки сжимаемости
+COMPRESS_MIN_RATIO = 0.9  # Сжимаем, только если проба уменьшилась хотя бы на 10%
+COMPRESS_CHUNK_SIZE = 256 * 1024
+# Форматы, которые уже сжаты — их даже не пробуем
+INCOMPRESSIBLE_EXTENSIONS = {
+    '.gz', '.zip', '.7z', '.rar', '.bz2', '.xz', '.zst', '.jpg', '.jpeg', '.png',
+    '.gif', '.webp', '.mp3', '.mp4', '.docx', '.xlsx', '.pptx', '.odt', '.ods',
+    '.sig', '.p7s', '.p7m', '.sgn', COMPRESSED_SUFFIX
+}
+
+def is_compressible(path):
+    """Оценивает по пробе из начала файла, имеет ли смысл его сжимать."""
+    if os.path.splitext(path)[1].lower() in INCOMPRESSIBLE_EXTENSIONS:
+        return False
+    with open(path, 'rb') as f:
+        sample = f.read(COMPRESS_SAMPLE_SIZE)
+    if len(sample) < 512:
+        return False
+    return len(zlib.compress(sample, 1)) < len(sample) * COMPRESS_MIN_RATIO
+
+def local_name_for(remote_name):
+    """Возвращает локальное имя файла для имени на сервере (без суффикса сжатия)."""
+    if remote_name.endswith(COMPRESSED_SUFFIX):
+        return remote_name[:-len(COMPRESSED_SUFFIX)]
+    return remote_name
+
 # === Клиентская логика (SFTPWorker) ===
 class SFTPWorker:
     def __init__(self, config_dict, log_callback):
@@ -44,6 +150,9 @@ class SFTPWorker:
         self.log_callback = log_callback
         self.stop_event = threading.Event()
         self.mode = config_dict.get('mode', 'client')
+        self.fatal_error = False  # Ошибка конфигурации, повторять запуск бессмысленно
+        self.rejected_files = set()  # Файлы, которые нельзя отправить (уже сообщено в лог)
+        self.connected_event = threading.Event()  # Устанавливается после первого успешного подключения
 
     def log(self, msg):
         if self.log_callback:
@@ -67,16 +176,22 @@ class SFTPWorker:
             username = f"{client_id}-{workspace}"
             if not os.path.exists(ssh_key):
                 self.log(f"? SSH-ключ не найден: {ssh_key}")
+                self.fatal_error = True
                 return
             self.log(f"[OK] {self.mode} запущен: {username}")
             self.log(f" Интервал опроса: {poll_interval} сек")
+            if self.config.get('ssh_compression', False) or self.config.get('payload_compression', False):
+                self.log(f" Сжатие: SSH={'да' if self.config.get('ssh_compression', False) else 'нет'}, "
+                         f"файлы={'да' if self.config.get('payload_compression', False) else 'нет'}")
             while not self.stop_event.is_set():
                 try:
                     key = Ed25519Key(filename=ssh_key)
                     ssh = paramiko.SSHClient()
                     ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                    ssh.connect(ssh_host, port=ssh_port, username=username, pkey=key, timeout=10)
+                    ssh.connect(ssh_host, port=ssh_port, username=username, pkey=key, timeout=10,
+                                compress=bool(self.config.get('ssh_compression', False)))
                     sftp = ssh.open_sftp()
+                    self.connected_event.set()
                     if self.mode == 'client':
                         self.process_incoming(sftp, incoming_local, sent_dir, 'in')
                         self.process_outgoing(sftp, outgoing_local, sent_dir, 'out')
@@ -98,6 +213,7 @@ class SFTPWorker:
                         time.sleep(poll_interval)
         except Exception as e:
             self.log(f"? Критическая ошибка: {e}")
+            self.fatal_error = True
 
     def get_incoming_path(self):
         client_id = self.config['client_id']
@@ -129,7 +245,7 @@ class SFTPWorker:
         for f in list(remote_files):
             received_marker = os.path.join(sent_dir, f"{f}.received")
             if os.path.exists(received_marker):
-                if f not in local_files:
+                if local_name_for(f) not in local_files:
                     try:
                         sftp.remove(f'{remote_subdir}/{f}')
                         os.remove(received_marker)
@@ -138,16 +254,40 @@ class SFTPWorker:
                         self.log(f"? Ошибка удаления {f}: {e}")
         for f in remote_files:
             received_marker = os.path.join(sent_dir, f"{f}.received")
-            if f not in local_files and not os.path.exists(received_marker):
+            local_name = local_name_for(f)
+            if local_name not in local_files and not os.path.exists(received_marker):
                 try:
-                    local_path = os.path.join(incoming_local, f)
-                    sftp.get(f'{remote_subdir}/{f}', local_path)
-                    self.log(f"?? Получен: {f}")
+                    local_path = os.path.join(incoming_local, local_name)
+                    if local_name != f:
+                        self.get_decompressed(sftp, f'{remote_subdir}/{f}', local_path)
+                    else:
+                        sftp.get(f'{remote_subdir}/{f}', local_path)
+                    self.log(f"?? Получен: {local_name}")
                     with open(received_marker, 'w') as fp:
                         fp.write(f"{time.time()}\n")
                 except Exception as e:
                     self.log(f"? Ошибка получения {f}: {e}")
 
+    def get_decompressed(self, sftp, remote_path, local_path):
+        """Скачивает сжатый файл, распаковывая его на лету."""
+        tmp_path = local_path + '.part'
+        try:
+            with sftp.open(remote_path, 'rb') as remote:
+                remote.prefetch()
+                with gzip.GzipFile(fileobj=remote, mode='rb') as src, open(tmp_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, COMPRESS_CHUNK_SIZE)
+            os.replace(tmp_path, local_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def put_compressed(self, sftp, local_path, remote_path):
+        """Отправляет файл, сжимая его на лету."""
+        with open(local_path, 'rb') as src, sftp.open(remote_path, 'wb') as remote:
+            remote.set_pipelined(True)
+            with gzip.GzipFile(filename=os.path.basename(local_path), fileobj=remote, mode='wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, COMPRESS_CHUNK_SIZE)
+
     def process_outgoing(self, sftp, outgoing_local, sent_dir, remote_subdir):
         try:
             remote_files = set(sftp.listdir(remote_subdir))
@@ -157,7 +297,7 @@ class SFTPWorker:
         local_files = set(os.listdir(outgoing_local))
         for f in list(local_files):
             sent_marker = os.path.join(sent_dir, f"{f}.sent")
-            if os.path.exists(sent_marker) and f not in remote_files:
+            if os.path.exists(sent_marker) and f not in remote_files and f + COMPRESSED_SUFFIX not in remote_files:
                 try:
                     os.remove(os.path.join(outgoing_local, f))
                     os.remove(sent_marker)
@@ -167,21 +307,49 @@ class SFTPWorker:
         current_local = set(os.listdir(outgoing_local))
         for f in current_local:
             sent_marker = os.path.join(sent_dir, f"{f}.sent")
+            if f.endswith(COMPRESSED_SUFFIX):
+                # Получатель принял бы такой файл за сжатый и попытался бы его распаковать
+                if f not in self.rejected_files:
+                    self.rejected_files.add(f)
+                    self.log(f"? Файл не отправлен: имя не может оканчиваться на {COMPRESSED_SUFFIX}: {f}")
+                continue
             if not os.path.exists(sent_marker):
                 try:
-                    sftp.put(os.path.join(outgoing_local, f), f'{remote_subdir}/{f}')
+                    local_path = os.path.join(outgoing_local, f)
+                    if self.config.get('payload_compression', False) and is_compressible(local_path):
+                        self.put_compressed(sftp, local_path, f'{remote_subdir}/{f}{COMPRESSED_SUFFIX}')
+                        self.log(f" Отправлен (сжат): {f}")
+                    else:
+                        sftp.put(local_path, f'{remote_subdir}/{f}')
+                        self.log(f" Отправлен: {f}")
                     with open(sent_marker, 'w') as fp:
                         fp.write(f"{time.time()}\n")
-                    self.log(f" Отправлен: {f}")
                 except Exception as e:
                     self.log(f"? Ошибка отправки {f}: {e}")
 
 # === Основное окно ===
+_ui_class = None
+
+def get_ui_class():
+    """Загружает класс Ui_MainWindow при первом обращении.
+
+    Откладывается до создания окна, чтобы __main__ успел обновить кэш
+    через compile_ui() и .ui не разбирался дважды.
+    """
+    global _ui_class
+    if _ui_class is None:
+        _ui_class = load_ui_class()
+    return _ui_class
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        # Загружаем UI из файла
-        PyQt6.uic.loadUi('main_window.ui', self) # <--- Загружаем .ui файл
+        # Строим UI из скомпилированного main_window.ui
+        self.ui = get_ui_class()()
+        self.ui.setupUi(self)
+        # Виджеты доступны как атрибуты окна: self.table, self.add_btn и т.д.
+        for name, widget in vars(self.ui).items():
+            setattr(self, name, widget)
 
         # Устанавливаем фиксированный размер окна, если нужно
         self.resize(1400, 900)
@@ -194,6 +362,11 @@ class MainWindow(QMainWindow):
         self.workers = {}
         self.log_queue = queue.Queue()
         self.currently_selected_key = "" # Для отслеживания текущей строки
+        self.first_paint_done = False
+        self.resume_pending = set()  # Рабочие места, автоматически запущенные при старте и ещё не подключившиеся
+        self.resume_connected = set()
+        self.resume_failed = set()
+        self.resume_started_at = None
 
         # === Настройка элементов интерфейса ===
         # Настройка заголовков таблицы
@@ -235,24 +408,98 @@ class MainWindow(QMainWindow):
         # === Загрузка конфигурации ===
         config = load_config()
         self.workspaces = config.get("workspaces", {})
-        self.refresh_table()
 
         # === Таймер для логов ===
         self.log_timer = QTimer()
         self.log_timer.timeout.connect(self._poll_logs)
-        self.log_timer.start(100)
 
         # === Первая запись в лог при запуске ===
         self.log_text.append(f'<span style="color: rgb(230, 208, 16)">[{time.strftime("%H:%M:%S")}] Logs:</span>')
         # self.log_callback(f"[{time.strftime('%H:%M:%S')}] Logs:")
         
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            # Всё, что не нужно для первой отрисовки окна, выполняем после неё
+            self.first_paint_done = True
+            self.log_callback(f"Окно показано через {time.perf_counter() - APP_START:.2f} сек после запуска")
+            QTimer.singleShot(0, self._deferred_init)
+
+    def _deferred_init(self):
+        """Донастройка окна после первой отрисовки: таблица, логи, автозапуск."""
         # Устанавливаем сплиттер 50/50
-        QTimer.singleShot(0, self._set_splitter_equal)
+        self._set_splitter_equal()
+        self.refresh_table()
+        self.log_timer.start(100)
+        self.resume_workers()
+
+    def resume_workers(self):
+        """Запускает рабочие места, работавшие при прошлом закрытии приложения.
+
+        Подключения стартуют параллельно, но с небольшим сдвигом, чтобы
+        не устраивать одновременный наплыв SSH-рукопожатий.
+        """
+        keys = sorted(key for key, ws in self.workspaces.items() if ws.get("autostart", False))
+        if not keys:
+            return
+        self.log_callback(f"Автозапуск рабочих мест: {len(keys)}")
+        self.resume_pending = set(keys)
+        self.resume_connected = set()
+        self.resume_failed = set()
+        self.resume_started_at = time.perf_counter()
+        for i, key in enumerate(keys):
+            QTimer.singleShot(i * RESUME_STAGGER_MS, lambda key=key: self.start_worker(key))
+
+    def _check_resume_progress(self):
+        """Сообщает, сколько автоматически запущенных рабочих мест подключилось.
+
+        Отчёт выводится, когда все подключились или завершились с ошибкой,
+        либо по истечении RESUME_REPORT_TIMEOUT секунд.
+        """
+        for key in list(self.resume_pending):
+            if key in self.workers:
+                thread, worker = self.workers[key]
+                if worker.connected_event.is_set():
+                    self.resume_pending.discard(key)
+                    self.resume_connected.add(key)
+                elif not thread.is_alive():
+                    self.resume_pending.discard(key)
+                    self.resume_failed.add(key)
+            elif key not in self.workspaces or not self.workspaces[key].get("autostart", False):
+                # Остановлено или удалено вручную — в отчёт не входит
+                self.resume_pending.discard(key)
+            # Иначе ещё ждёт своей очереди на запуск
+        elapsed = time.perf_counter() - self.resume_started_at
+        if self.resume_pending and elapsed < RESUME_REPORT_TIMEOUT:
+            return
+        not_connected = sorted(self.resume_failed | self.resume_pending)
+        total = len(self.resume_connected) + len(not_connected)
+        self.log_callback(f"Восстановление: подключено {len(self.resume_connected)} из {total} за {elapsed:.2f} сек "
+                          f"({time.perf_counter() - APP_START:.2f} сек после запуска)")
+        if self.resume_failed:
+            self.log_callback(f"Не запустились: {', '.join(sorted(self.resume_failed))}")
+        if self.resume_pending:
+            self.log_callback(f"Не подключились за {RESUME_REPORT_TIMEOUT} сек: {', '.join(sorted(self.resume_pending))}")
+        self.resume_started_at = None
+
+    def _reap_workers(self):
+        """Убирает worker'ы, завершившиеся из-за ошибки конфигурации, и снимает их автозапуск."""
+        for key in list(self.workers.keys()):
+            thread, worker = self.workers[key]
+            if worker.fatal_error and not thread.is_alive():
+                if key in self.resume_pending:
+                    self.resume_pending.discard(key)
+                    self.resume_failed.add(key)
+                self.stop_worker(key)
+                self.log_callback(f"Рабочее место '{key}' остановлено из-за ошибки, автозапуск снят")
 
     def log_callback(self, msg):
         self.log_queue.put(msg)
 
     def _poll_logs(self):
+        self._reap_workers()
+        if self.resume_started_at is not None:
+            self._check_resume_progress()
         try:
             while True:
                 msg = self.log_queue.get_nowait()
@@ -333,6 +580,8 @@ class MainWindow(QMainWindow):
         self.outgoing_edit.clear()
         self.meta_edit.clear()
         self.key_edit.clear()
+        self.ssh_compression_cb.setChecked(False)
+        self.payload_compression_cb.setChecked(False)
         # Сбрасываем радиокнопки
         self.mode_group.setExclusive(False)
         for rb in self.mode_group.buttons():
@@ -351,6 +600,8 @@ class MainWindow(QMainWindow):
         self.host_edit.setText(ws.get("ssh_host", ""))
         self.port_edit.setText(str(ws.get("ssh_port", 22)))
         self.interval_edit.setText(str(ws.get("poll_interval", 5)))
+        self.ssh_compression_cb.setChecked(bool(ws.get("ssh_compression", False)))
+        self.payload_compression_cb.setChecked(bool(ws.get("payload_compression", False)))
 
         # Устанавливаем нужный режим
         mode = ws.get("mode", "client")
@@ -415,7 +666,9 @@ class MainWindow(QMainWindow):
                 "ssh_host": self.host_edit.text().strip(),
                 "ssh_port": int(self.port_edit.text().strip()),
                 "poll_interval": int(self.interval_edit.text().strip()),
-                "mode": self.get_current_mode()
+                "mode": self.get_current_mode(),
+                "ssh_compression": self.ssh_compression_cb.isChecked(),
+                "payload_compression": self.payload_compression_cb.isChecked()
             })
 
             # Если ключ изменился (client_id или workspace)
@@ -489,22 +742,33 @@ class MainWindow(QMainWindow):
         thread = threading.Thread(target=worker.run, daemon=True)
         self.workers[key] = (thread, worker)
         thread.start()
+        self.set_autostart(key, True)
         self.refresh_table()
         # Обновляем кнопку в правой панели
         if key == self.currently_selected_key:
             self.start_stop_btn.setText("◼ Остановить")
 
-    def stop_worker(self, key):
+    def stop_worker(self, key, persist=True):
+        """Останавливает worker; при persist=False автозапуск при следующем старте сохраняется."""
         if key in self.workers:
             thread, worker = self.workers[key]
             worker.stop_event.set()
             thread.join(timeout=5)
             del self.workers[key]
+        if persist:
+            self.set_autostart(key, False)
         self.refresh_table()
         # Обновляем кнопку в правой панели
         if key == self.currently_selected_key:
             self.start_stop_btn.setText("▶ Запустить")
 
+    def set_autostart(self, key, enabled):
+        """Запоминает в конфигурации, запускать ли рабочее место при старте приложения."""
+        if key not in self.workspaces or self.workspaces[key].get("autostart", False) == enabled:
+            return
+        self.workspaces[key]["autostart"] = enabled
+        save_config({"workspaces": self.workspaces})
+
     def stop_all_workers(self):
         for key in list(self.workers.keys()):
             self.stop_worker(key)
@@ -518,7 +782,9 @@ class MainWindow(QMainWindow):
             "ssh_host": "without.su",
             "ssh_port": 22,
             "mode": "client",
-            "poll_interval": 5
+            "poll_interval": 5,
+            "ssh_compression": False,
+            "payload_compression": False
         }
         key = f"new_{len(self.workspaces)}" # Временный ключ
         self.workspaces[key] = new_config
@@ -536,6 +802,8 @@ class MainWindow(QMainWindow):
             self.host_edit.setText(new_config["ssh_host"])
             self.port_edit.setText(str(new_config["ssh_port"]))
             self.interval_edit.setText(str(new_config["poll_interval"]))
+            self.ssh_compression_cb.setChecked(new_config["ssh_compression"])
+            self.payload_compression_cb.setChecked(new_config["payload_compression"])
             self.mode_client_rb.setChecked(True) # Установим первый режим
             self.update_paths_for_current() # Обновим пути
             self.currently_selected_key = key # Обновим текущий ключ
@@ -624,20 +892,26 @@ class MainWindow(QMainWindow):
             self.main_splitter.setSizes([total // 2, total // 2])   
 
     def closeEvent(self, event):
+        # Останавливаем без сброса автозапуска, чтобы при следующем старте восстановить работу
+        for _, worker in self.workers.values():
+            worker.stop_event.set()
         for key in list(self.workers.keys()):
-            self.stop_worker(key)
+            self.stop_worker(key, persist=False)
         event.accept()
 
 def load_stylesheet():
-    """Загружает файл стилей из файла styles.css"""
+    """Загружает файл стилей из файла styles.css в каталоге приложения"""
     try:
-        with open('styles.css', 'r', encoding='utf-8') as f:
+        with open(STYLES_PATH, 'r', encoding='utf-8') as f:
             return f.read()
     except FileNotFoundError:
         return ""
 
 
 if __name__ == "__main__":
+    # Готовим ui_main_window.py для следующих запусков (при импорте модуля на диск ничего не пишется)
+    compile_ui()
+
     app = QApplication(sys.argv)
     
     # Применяем стили
@@ -6,13 +6,18 @@ import sys
 import os
 import time
 import signal
+import io
+import tempfile
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import QTimer
 
 # Добавляем путь к проекту
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from main_pysaid import MainWindow
+import main_pysaid
+from main_pysaid import (
+    MainWindow, SFTPWorker, COMPRESSED_SUFFIX, is_compressible, local_name_for
+)
 
 def test_app():
     app = QApplication(sys.argv)
@@ -45,5 +50,106 @@ def test_app():
     # Запускаем цикл событий
     sys.exit(app.exec())
 
+class FakeSFTPFile(io.BytesIO):
+    """Файл на \"сервере\": содержимое сохраняется в FakeSFTP при закрытии."""
+    def __init__(self, sftp, path, data=b''):
+        super().__init__(data)
+        self.sftp = sftp
+        self.path = path
+
+    def prefetch(self):
+        pass
+
+    def set_pipelined(self, pipelined=True):
+        pass
+
+    def close(self):
+        if not self.closed:
+            self.sftp.files[self.path] = self.getvalue()
+        super().close()
+
+
+class FakeSFTP:
+    """Минимальная замена paramiko.SFTPClient для проверки сжатия без сети."""
+    def __init__(self):
+        self.files = {}
+
+    def open(self, path, mode='rb'):
+        if 'w' in mode:
+            return FakeSFTPFile(self, path)
+        return FakeSFTPFile(self, path, self.files[path])
+
+
+def write_file(directory, name, data):
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def test_is_compressible():
+    with tempfile.TemporaryDirectory() as tmp:
+        text = b'<row><id>1</id><name>Highway</name></row>\n' * 2000
+        assert is_compressible(write_file(tmp, 'data.xml', text)), "Текст должен сжиматься"
+        assert not is_compressible(write_file(tmp, 'data.bin', os.urandom(100000))), "Случайные данные не сжимаются"
+        assert not is_compressible(write_file(tmp, 'small.csv', b'a;b;c\n' * 50)), "Файлы меньше 512 байт не сжимаются"
+        assert not is_compressible(write_file(tmp, 'archive.zip', text)), "Известные сжатые форматы пропускаются"
+        assert not is_compressible(write_file(tmp, 'doc.XLSX', text)), "Расширение проверяется без учёта регистра"
+        assert not is_compressible(write_file(tmp, 'data.xml' + COMPRESSED_SUFFIX, text))
+
+
+def test_local_name_for():
+    assert local_name_for('report.xml' + COMPRESSED_SUFFIX) == 'report.xml'
+    assert local_name_for('report.xml') == 'report.xml'
+    assert local_name_for('report.gz') == 'report.gz'
+    assert local_name_for(COMPRESSED_SUFFIX + '.xml') == COMPRESSED_SUFFIX + '.xml'
+
+
+def test_compressed_round_trip():
+    worker = SFTPWorker({'client_id': 'c', 'workspace': 'w'}, None)
+    sftp = FakeSFTP()
+    data = b'id;amount;comment\n' + b''.join(b'%d;%d;payment\n' % (i, i * 7) for i in range(20000))
+    with tempfile.TemporaryDirectory() as tmp:
+        src = write_file(tmp, 'payments.csv', data)
+        remote_path = 'out/payments.csv' + COMPRESSED_SUFFIX
+        worker.put_compressed(sftp, src, remote_path)
+        assert len(sftp.files[remote_path]) < len(data) // 2, "Файл должен передаваться сжатым"
+
+        dst = os.path.join(tmp, 'received.csv')
+        worker.get_decompressed(sftp, remote_path, dst)
+        with open(dst, 'rb') as f:
+            assert f.read() == data, "После распаковки содержимое должно совпадать"
+        assert not os.path.exists(dst + '.part'), "Временный файл должен удаляться"
+
+
+def test_ui_cache_tracks_ui_contents():
+    ui_path, cache_path = main_pysaid.UI_PATH, main_pysaid.UI_CACHE_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            main_pysaid.UI_PATH = os.path.join(tmp, 'main_window.ui')
+            main_pysaid.UI_CACHE_PATH = os.path.join(tmp, 'ui_main_window.py')
+            with open(ui_path, 'rb') as f:
+                ui_source = f.read()
+            write_file(tmp, 'main_window.ui', ui_source)
+            assert not main_pysaid.ui_cache_is_fresh(), "Без кэша он не может быть актуальным"
+
+            main_pysaid.compile_ui()
+            assert main_pysaid.ui_cache_is_fresh(), "Кэш должен совпадать с .ui"
+            assert hasattr(main_pysaid.load_ui_class(), 'setupUi')
+
+            # Изменённый .ui с датой старше кэша (как после распаковки обновления)
+            write_file(tmp, 'main_window.ui', ui_source.replace(b'Client ID:', b'Client:'))
+            os.utime(main_pysaid.UI_PATH, (0, 0))
+            assert not main_pysaid.ui_cache_is_fresh(), "Кэш от другой версии .ui устарел независимо от дат"
+        finally:
+            main_pysaid.UI_PATH, main_pysaid.UI_CACHE_PATH = ui_path, cache_path
+
+
 if __name__ == "__main__":
+    test_is_compressible()
+    test_local_name_for()
+    test_compressed_round_trip()
+    print("Проверки сжатия пройдены")
+    test_ui_cache_tracks_ui_contents()
+    print("Проверка кэша интерфейса пройдена")
     test_app()
\ No newline at end of file